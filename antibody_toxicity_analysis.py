@@ -6,24 +6,45 @@ with a focus on their toxicity profiles.
 """
 
 import pandas as pd
-import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as pa_ds
 import requests
 import zipfile
 import os
+import shutil
+import hashlib
 import re
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
 class AntibodyToxicityAnalyzer:
+    # Keywords to identify antibody therapeutics, compiled once when the class
+    # is defined and shared by every analyzer instance. Phrases that contain
+    # another keyword ('monoclonal antibody', 'antibody-drug conjugate',
+    # 'chimeric antigen receptor', ...) are left out because the shorter
+    # keyword already matches them as a substring
+    antibody_keywords = [
+        'antibody', 'antibodies', 'mab',
+        'immunoglobulin', 'igg', 'igm', 'iga', 'ige', 'igd',
+        'anti-', 'anti ', 'humanized', 'chimeric', 'bispecific',
+        'adc', 'car-t', 'cart',
+        'fusion protein', 'immunoconjugate'
+    ]
+    antibody_pattern = re.compile('|'.join(map(re.escape, antibody_keywords)), re.IGNORECASE)
+    
     def __init__(self, data_dir="aact_data"):
         self.data_dir = data_dir
+        self.cache_dir = os.path.join(data_dir, "cache")
         self.connection = None
+        self.studies = None
+        self.interventions = None
         self.antibody_trials = None
         self.toxicity_data = None
+        # Results of analyze_toxicity_profiles, reused by the report and the
+        # plots until the trial or toxicity data is rebuilt
+        self.analysis_results = None
         
     def download_aact_data(self):
         """Download the AACT dataset from the official source"""
@@ -40,10 +61,12 @@ class AntibodyToxicityAnalyzer:
             response = requests.get(base_url, stream=True)
             response.raise_for_status()
             
+            # Copy the archive to disk in 1 MiB blocks straight from the raw
+            # stream rather than iterating over small Python-level chunks
             zip_path = os.path.join(self.data_dir, "aact_data.zip")
+            response.raw.decode_content = True
             with open(zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                shutil.copyfileobj(response.raw, f, 1 << 20)
             
             # Extract the zip file
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
@@ -63,13 +86,35 @@ class AntibodyToxicityAnalyzer:
         print("Loading AACT data...")
         
         try:
-            # Load key tables
-            self.studies = pd.read_csv(os.path.join(self.data_dir, "studies.csv"))
-            self.conditions = pd.read_csv(os.path.join(self.data_dir, "conditions.csv"))
-            self.interventions = pd.read_csv(os.path.join(self.data_dir, "interventions.csv"))
-            self.outcomes = pd.read_csv(os.path.join(self.data_dir, "outcomes.csv"))
-            self.adverse_events = pd.read_csv(os.path.join(self.data_dir, "adverse_events.csv"))
-            self.sponsors = pd.read_csv(os.path.join(self.data_dir, "sponsors.csv"))
+            # Confirm every table the analysis reads is present with a single
+            # directory scan so a missing file fails fast instead of after the
+            # large CSVs are parsed
+            with os.scandir(self.data_dir) as entries:
+                available = {entry.name for entry in entries if entry.is_file()}
+            required = ["studies.csv", "interventions.csv", "adverse_events.csv"]
+            missing = [name for name in required if name not in available]
+            if missing:
+                raise FileNotFoundError(", ".join(missing))
+            
+            # Load key tables, projecting the wide AACT tables down to the
+            # columns the analysis actually reads. Columns with only a handful
+            # of distinct values are categoricals, so string matching and
+            # grouping work on their categories rather than on every row
+            self.studies = pd.read_csv(
+                os.path.join(self.data_dir, "studies.csv"),
+                engine='pyarrow',
+                usecols=['nct_id', 'brief_title', 'official_title', 'study_type', 'phase', 'overall_status'],
+                dtype={'study_type': 'category', 'phase': 'category'}
+            )
+            self.interventions = pd.read_csv(
+                os.path.join(self.data_dir, "interventions.csv"),
+                engine='pyarrow',
+                usecols=['nct_id', 'intervention_type', 'intervention_name'],
+                # Arrow-backed strings let str.contains run on Arrow's regex kernel
+                dtype={'intervention_type': 'category', 'intervention_name': 'string[pyarrow]'}
+            )
+            # adverse_events.csv is the largest table; it is scanned in
+            # extract_toxicity_data once the antibody trials are known
             
             print("Data loaded successfully!")
             return True
@@ -78,36 +123,84 @@ class AntibodyToxicityAnalyzer:
             print("AACT data files not found. Please ensure the dataset is downloaded.")
             return False
     
+    def cache_key(self):
+        """Build a key for cached results from the input tables and keywords"""
+        digest = hashlib.blake2b(self.antibody_pattern.pattern.encode(), digest_size=8)
+        for name in ["studies.csv", "interventions.csv", "adverse_events.csv"]:
+            stat = os.stat(os.path.join(self.data_dir, name))
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+    
+    def load_cached_results(self):
+        """Load antibody trials and toxicity data saved by an earlier run"""
+        try:
+            key = self.cache_key()
+        except FileNotFoundError:
+            return False
+        
+        trials_path = os.path.join(self.cache_dir, f"{key}_antibody_trials.parquet")
+        toxicity_path = os.path.join(self.cache_dir, f"{key}_toxicity_data.parquet")
+        if not (os.path.exists(trials_path) and os.path.exists(toxicity_path)):
+            return False
+        
+        print("Loading cached antibody trials and toxicity data...")
+        self.antibody_trials = pd.read_parquet(trials_path)
+        self.toxicity_data = pd.read_parquet(toxicity_path)
+        self.analysis_results = None
+        
+        print(f"Loaded {len(self.antibody_trials)} antibody trials and {len(self.toxicity_data)} adverse events from cache")
+        return True
+    
+    def save_cached_results(self):
+        """Save antibody trials and toxicity data so later runs can skip the CSVs"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.cache_key()
+        
+        # Remove results cached under earlier keys; they can never match again
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".parquet") and not entry.name.startswith(f"{key}_"):
+                    os.remove(entry.path)
+        
+        self.antibody_trials.to_parquet(os.path.join(self.cache_dir, f"{key}_antibody_trials.parquet"))
+        self.toxicity_data.to_parquet(os.path.join(self.cache_dir, f"{key}_toxicity_data.parquet"))
+        print(f"Cached antibody trials and toxicity data in {self.cache_dir}")
+    
     def identify_antibody_trials(self):
         """Identify trials involving antibody therapeutics"""
         print("Identifying antibody therapeutic trials...")
         
-        # Keywords to identify antibody therapeutics
-        antibody_keywords = [
-            'antibody', 'antibodies', 'mab', 'monoclonal antibody', 'monoclonal antibodies',
-            'immunoglobulin', 'igg', 'igm', 'iga', 'ige', 'igd',
-            'anti-', 'anti ', 'humanized', 'chimeric', 'bispecific',
-            'adc', 'antibody-drug conjugate', 'antibody drug conjugate',
-            'car-t', 'cart', 'chimeric antigen receptor',
-            'fusion protein', 'immunoconjugate'
-        ]
+        # The source tables are released after each selection, so reload
+        # them if this is called again
+        if self.studies is None and not self.load_data():
+            return None
         
-        # Create regex pattern
-        pattern = '|'.join(antibody_keywords)
-        
-        # Filter interventions for antibody-related terms
-        antibody_interventions = self.interventions[
-            self.interventions['intervention_name'].str.contains(pattern, case=False, na=False) |
-            self.interventions['intervention_type'].str.contains('biological', case=False, na=False)
-        ]
+        # Filter interventions for antibody-related terms. The literal type
+        # check is cheap, so the keyword regex only scans the names of
+        # interventions that are not already flagged as biologicals
+        is_biological = self.interventions['intervention_type'].str.contains('biological', case=False, regex=False, na=False)
+        others = self.interventions.loc[~is_biological]
+        # Pass the pattern text rather than the compiled object: pandas 2.x
+        # forwards a compiled pattern to Arrow's regex kernel, which rejects it
+        keyword_match = others['intervention_name'].str.contains(self.antibody_pattern.pattern, case=False, na=False)
         
         # Get unique study IDs
-        antibody_study_ids = antibody_interventions['nct_id'].unique()
-        
-        # Filter studies
-        self.antibody_trials = self.studies[
+        antibody_study_ids = pd.concat([
+            self.interventions.loc[is_biological, 'nct_id'],
+            others.loc[keyword_match, 'nct_id']
+        ]).unique()
+        
+        # Filter studies; the boolean selection already returns a new frame
+        # (and studies is projected to the used columns), so no extra copy
+        self.antibody_trials = self.studies.loc[
             self.studies['nct_id'].isin(antibody_study_ids)
-        ].copy()
+        ]
+        self.analysis_results = None
+        
+        # Only the selected trials are used from here on; drop the full
+        # tables so they do not stay resident for the rest of the run
+        self.studies = None
+        self.interventions = None
         
         print(f"Found {len(self.antibody_trials)} antibody therapeutic trials")
         return self.antibody_trials
@@ -119,26 +212,43 @@ class AntibodyToxicityAnalyzer:
         if self.antibody_trials is None:
             self.identify_antibody_trials()
         
-        # Get antibody trial IDs
-        antibody_nct_ids = self.antibody_trials['nct_id'].tolist()
-        
-        # Filter adverse events for antibody trials
-        self.toxicity_data = self.adverse_events[
-            self.adverse_events['nct_id'].isin(antibody_nct_ids)
-        ].copy()
-        
-        # Add study information
-        self.toxicity_data = self.toxicity_data.merge(
+        # Scan adverse_events.csv with the antibody nct_ids pushed down into
+        # the reader, so only events from antibody trials are materialised
+        # rather than the whole table
+        antibody_nct_ids = pa.array(self.antibody_trials['nct_id'], type=pa.string())
+        # Column types are pinned because the streaming scan would otherwise
+        # infer them from the first block, where sparse AACT columns such as
+        # serious can be entirely empty
+        csv_format = pa_ds.CsvFileFormat(
+            convert_options=pa_csv.ConvertOptions(
+                column_types={'nct_id': pa.string(), 'adverse_event_term': pa.string(), 'serious': pa.string()},
+                strings_can_be_null=True
+            )
+        )
+        adverse_events = pa_ds.dataset(
+            os.path.join(self.data_dir, "adverse_events.csv"), format=csv_format
+        ).to_table(
+            columns=['nct_id', 'adverse_event_term', 'serious'],
+            filter=pa_ds.field('nct_id').isin(antibody_nct_ids)
+        ).to_pandas().astype({'adverse_event_term': 'string[pyarrow]', 'serious': 'category'})
+        
+        # Add study information in one hash join; an inner merge keeps the
+        # events in their original order
+        self.toxicity_data = adverse_events.merge(
             self.antibody_trials[['nct_id', 'brief_title', 'official_title', 'study_type', 'phase']],
             on='nct_id',
-            how='left'
+            how='inner'
         )
+        self.analysis_results = None
         
         print(f"Extracted toxicity data for {len(self.toxicity_data)} adverse events")
         return self.toxicity_data
     
     def analyze_toxicity_profiles(self):
         """Analyze toxicity profiles of antibody therapeutics"""
+        if self.analysis_results is not None:
+            return self.analysis_results
+        
         print("Analyzing toxicity profiles...")
         
         if self.toxicity_data is None:
@@ -150,19 +260,21 @@ class AntibodyToxicityAnalyzer:
         # 1. Overall toxicity statistics
         analysis_results['total_adverse_events'] = len(self.toxicity_data)
         analysis_results['unique_trials'] = self.toxicity_data['nct_id'].nunique()
-        analysis_results['unique_events'] = self.toxicity_data['adverse_event_term'].nunique()
+        # Shared by the distinct-term count and the top-N list
+        event_counts = self.toxicity_data['adverse_event_term'].value_counts()
+        analysis_results['unique_events'] = len(event_counts)
         
         # 2. Most common adverse events
-        top_adverse_events = self.toxicity_data['adverse_event_term'].value_counts().head(20)
+        top_adverse_events = event_counts.head(20)
         analysis_results['top_adverse_events'] = top_adverse_events
         
         # 3. Toxicity by study phase
-        phase_toxicity = self.toxicity_data.groupby('phase')['adverse_event_term'].count().sort_values(ascending=False)
+        phase_toxicity = self.toxicity_data.groupby('phase', observed=True)['adverse_event_term'].count().sort_values(ascending=False)
         analysis_results['toxicity_by_phase'] = phase_toxicity
         
         # 4. Serious adverse events
         serious_events = self.toxicity_data[
-            self.toxicity_data['serious'].str.contains('yes', case=False, na=False)
+            self.toxicity_data['serious'].str.contains('yes', case=False, regex=False, na=False)
         ]
         analysis_results['serious_adverse_events'] = len(serious_events)
         analysis_results['top_serious_events'] = serious_events['adverse_event_term'].value_counts().head(10)
@@ -175,6 +287,7 @@ class AntibodyToxicityAnalyzer:
         completion_analysis = self.analyze_study_completion()
         analysis_results['completion_analysis'] = completion_analysis
         
+        self.analysis_results = analysis_results
         return analysis_results
     
     def categorize_by_organ_system(self, adverse_events):
@@ -192,10 +305,14 @@ class AntibodyToxicityAnalyzer:
             'General': ['fatigue', 'fever', 'pain', 'edema', 'weight']
         }
         
+        # Match keywords once per distinct term, weighted by its count
+        term_counts = adverse_events.value_counts()
+        terms = term_counts.index
+        
         categorized = {}
         for category, keywords in organ_categories.items():
             pattern = '|'.join(keywords)
-            count = adverse_events.str.contains(pattern, case=False, na=False).sum()
+            count = term_counts[terms.str.contains(pattern, case=False)].sum()
             if count > 0:
                 categorized[category] = count
         
@@ -205,14 +322,16 @@ class AntibodyToxicityAnalyzer:
         """Analyze study completion rates and reasons for termination"""
         completion_stats = self.antibody_trials['overall_status'].value_counts()
         
-        # Look for safety-related terminations
-        safety_terminations = self.antibody_trials[
-            self.antibody_trials['overall_status'].str.contains('terminated|suspended|withdrawn', case=False, na=False)
-        ]
+        # Look for safety-related terminations among the distinct statuses
+        # and add up their counts rather than scanning every trial again
+        statuses = completion_stats.index
+        safety_terminations = completion_stats[
+            statuses.str.contains('terminated|suspended|withdrawn', case=False)
+        ].sum()
         
         return {
             'completion_stats': completion_stats,
-            'safety_terminations': len(safety_terminations)
+            'safety_terminations': safety_terminations
         }
     
     def generate_summary_report(self):
@@ -276,6 +395,10 @@ Safety-related terminations: {analysis['completion_analysis']['safety_terminatio
         """Create visualizations for the analysis"""
         print("Creating visualizations...")
         
+        # Imported here so the data pipeline does not pay matplotlib's
+        # start-up cost when no plots are drawn
+        import matplotlib.pyplot as plt
+        
         analysis = self.analyze_toxicity_profiles()
         
         # Set up the plotting style
@@ -324,17 +447,22 @@ def main():
     # Initialize analyzer
     analyzer = AntibodyToxicityAnalyzer()
     
-    # Download and load data
-    if not analyzer.download_aact_data():
-        print("Please manually download the AACT dataset and place it in the 'aact_data' directory")
-        return
-    
-    if not analyzer.load_data():
-        return
-    
-    # Run analysis
-    analyzer.identify_antibody_trials()
-    analyzer.extract_toxicity_data()
+    # Reuse the antibody trials and toxicity data cached by an earlier run
+    # over the local CSVs; otherwise download, load and filter them. A cache
+    # hit skips the download, so the AACT snapshot is not refreshed until
+    # aact_data/cache/ is deleted or the local CSVs are replaced
+    if not analyzer.load_cached_results():
+        if not analyzer.download_aact_data():
+            print("Please manually download the AACT dataset and place it in the 'aact_data' directory")
+            return
+        
+        if not analyzer.load_data():
+            return
+        
+        # Run analysis
+        analyzer.identify_antibody_trials()
+        analyzer.extract_toxicity_data()
+        analyzer.save_cached_results()
     
     # Generate report and visualizations
     report = analyzer.generate_summary_report()
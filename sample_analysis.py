@@ -6,8 +6,7 @@ This script provides a sample analysis and can work with existing data or create
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
 from datetime import datetime
 import os
 import warnings
@@ -17,22 +16,40 @@ class SampleAntibodyAnalyzer:
     def __init__(self):
         self.antibody_trials = None
         self.toxicity_data = None
+        # Results of analyze_toxicity_profiles, reused by main, the report and
+        # the plots until the data is replaced
+        self.analysis_results = None
         
     def create_sample_data(self):
         """Create sample data for demonstration purposes"""
         print("Creating sample antibody therapeutics data...")
         
         # Sample antibody trials
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n_trials = 1000
         
+        # Build the ID and title columns with NumPy string ops instead of a
+        # per-row f-string comprehension
+        trial_index = np.arange(n_trials)
+        antibody_letters = np.array([chr(65 + i) for i in range(26)])
+        indications = np.array(['Cancer', 'Autoimmune', 'Infectious Disease'])
+        
+        # Low-cardinality labels are stored as categoricals so value_counts
+        # and groupby work on small integer codes instead of hashing strings
+        phases = ['Phase 1', 'Phase 2', 'Phase 3', 'Phase 4']
+        study_types = ['Interventional', 'Observational']
+        statuses = ['Completed', 'Recruiting', 'Terminated', 'Suspended']
+        
         trial_data = {
-            'nct_id': [f'NCT{str(i).zfill(8)}' for i in range(n_trials)],
-            'brief_title': [f'Study of Antibody {chr(65 + i % 26)} in {["Cancer", "Autoimmune", "Infectious Disease"][i % 3]}' for i in range(n_trials)],
-            'phase': np.random.choice(['Phase 1', 'Phase 2', 'Phase 3', 'Phase 4'], n_trials, p=[0.3, 0.4, 0.25, 0.05]),
-            'study_type': np.random.choice(['Interventional', 'Observational'], n_trials, p=[0.8, 0.2]),
-            'overall_status': np.random.choice(['Completed', 'Recruiting', 'Terminated', 'Suspended'], n_trials, p=[0.6, 0.25, 0.1, 0.05]),
-            'enrollment': np.random.randint(10, 1000, n_trials),
+            'nct_id': np.char.add('NCT', np.char.zfill(trial_index.astype(str), 8)),
+            'brief_title': np.char.add(
+                np.char.add('Study of Antibody ', antibody_letters[trial_index % 26]),
+                np.char.add(' in ', indications[trial_index % 3])
+            ),
+            'phase': pd.Categorical(rng.choice(phases, n_trials, p=[0.3, 0.4, 0.25, 0.05]), categories=phases),
+            'study_type': pd.Categorical(rng.choice(study_types, n_trials, p=[0.8, 0.2]), categories=study_types),
+            'overall_status': pd.Categorical(rng.choice(statuses, n_trials, p=[0.6, 0.25, 0.1, 0.05]), categories=statuses),
+            'enrollment': rng.integers(10, 1000, n_trials, dtype=np.int32),
             'start_date': pd.date_range('2015-01-01', periods=n_trials, freq='D'),
             'completion_date': pd.date_range('2018-01-01', periods=n_trials, freq='D')
         }
@@ -49,24 +66,31 @@ class SampleAntibodyAnalyzer:
             'Cardiac toxicity', 'Neuropathy', 'Seizure', 'Pneumonia', 'Sepsis'
         ]
         
+        # Event weights, normalised so they form a valid probability vector
+        event_weights = np.array([0.15, 0.12, 0.10, 0.08, 0.07, 0.06, 0.05, 0.04, 0.04, 0.03, 0.03, 0.03, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02, 0.02, 0.01, 0.01, 0.01, 0.01, 0.01, 0.005, 0.005, 0.005, 0.005, 0.005, 0.005, 0.005])
+        
+        serious_flags = ['Yes', 'No']
+        severities = ['Mild', 'Moderate', 'Severe']
+        outcomes = ['Recovered', 'Recovering', 'Not recovered', 'Fatal']
+        
         n_events = 5000
+        # Pick each event's trial by row position so study fields can be
+        # gathered by integer index rather than a string-keyed merge
+        event_trials = rng.integers(n_trials, size=n_events)
         event_data = {
-            'nct_id': np.random.choice(self.antibody_trials['nct_id'], n_events),
-            'adverse_event_term': np.random.choice(adverse_events, n_events, p=[0.15, 0.12, 0.10, 0.08, 0.07, 0.06, 0.05, 0.04, 0.04, 0.03, 0.03, 0.03, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02, 0.02, 0.01, 0.01, 0.01, 0.01, 0.01, 0.005, 0.005, 0.005, 0.005, 0.005, 0.005, 0.005]),
-            'serious': np.random.choice(['Yes', 'No'], n_events, p=[0.2, 0.8]),
-            'severity': np.random.choice(['Mild', 'Moderate', 'Severe'], n_events, p=[0.5, 0.3, 0.2]),
-            'outcome': np.random.choice(['Recovered', 'Recovering', 'Not recovered', 'Fatal'], n_events, p=[0.7, 0.2, 0.08, 0.02]),
-            'frequency': np.random.randint(1, 50, n_events)
+            'nct_id': self.antibody_trials['nct_id'].to_numpy()[event_trials],
+            'adverse_event_term': pd.Categorical(rng.choice(adverse_events, n_events, p=event_weights / event_weights.sum()), categories=adverse_events),
+            'serious': pd.Categorical(rng.choice(serious_flags, n_events, p=[0.2, 0.8]), categories=serious_flags),
+            'severity': pd.Categorical(rng.choice(severities, n_events, p=[0.5, 0.3, 0.2]), categories=severities, ordered=True),
+            'outcome': pd.Categorical(rng.choice(outcomes, n_events, p=[0.7, 0.2, 0.08, 0.02]), categories=outcomes),
+            'frequency': rng.integers(1, 50, n_events, dtype=np.int32),
+            # Add study information to toxicity data
+            'brief_title': self.antibody_trials['brief_title'].to_numpy()[event_trials],
+            'phase': self.antibody_trials['phase'].array.take(event_trials)
         }
         
         self.toxicity_data = pd.DataFrame(event_data)
-        
-        # Add study information to toxicity data
-        self.toxicity_data = self.toxicity_data.merge(
-            self.antibody_trials[['nct_id', 'brief_title', 'phase']],
-            on='nct_id',
-            how='left'
-        )
+        self.analysis_results = None
         
         print(f"Created sample data: {len(self.antibody_trials)} trials, {len(self.toxicity_data)} adverse events")
         return self.antibody_trials, self.toxicity_data
@@ -81,6 +105,7 @@ class SampleAntibodyAnalyzer:
                 print("Loading existing AACT data...")
                 self.antibody_trials = pd.read_csv(studies_path)
                 self.toxicity_data = pd.read_csv(adverse_events_path)
+                self.analysis_results = None
                 return True
             else:
                 print("AACT data not found, will use sample data")
@@ -91,6 +116,9 @@ class SampleAntibodyAnalyzer:
     
     def analyze_toxicity_profiles(self):
         """Analyze toxicity profiles of antibody therapeutics"""
+        if self.analysis_results is not None:
+            return self.analysis_results
+        
         print("Analyzing toxicity profiles...")
         
         if self.toxicity_data is None:
@@ -102,22 +130,27 @@ class SampleAntibodyAnalyzer:
         analysis_results['total_trials'] = len(self.antibody_trials)
         analysis_results['total_adverse_events'] = len(self.toxicity_data)
         analysis_results['unique_trials_with_events'] = self.toxicity_data['nct_id'].nunique()
-        analysis_results['unique_events'] = self.toxicity_data['adverse_event_term'].nunique()
+        # Shared by the distinct-term count and the top-N list
+        event_counts = self.toxicity_data['adverse_event_term'].value_counts()
+        # Categorical columns list every category, so drop terms that never occur
+        event_counts = event_counts[event_counts > 0]
+        analysis_results['unique_events'] = len(event_counts)
         
         # 2. Most common adverse events
-        top_adverse_events = self.toxicity_data['adverse_event_term'].value_counts().head(15)
+        top_adverse_events = event_counts.head(15)
         analysis_results['top_adverse_events'] = top_adverse_events
         
         # 3. Toxicity by study phase
-        phase_toxicity = self.toxicity_data.groupby('phase')['adverse_event_term'].count().sort_values(ascending=False)
+        phase_toxicity = self.toxicity_data.groupby('phase', observed=True)['adverse_event_term'].count().sort_values(ascending=False)
         analysis_results['toxicity_by_phase'] = phase_toxicity
         
         # 4. Serious adverse events
         serious_events = self.toxicity_data[
-            self.toxicity_data['serious'].str.contains('Yes', case=False, na=False)
+            self.toxicity_data['serious'].str.contains('Yes', case=False, regex=False, na=False)
         ]
         analysis_results['serious_adverse_events'] = len(serious_events)
-        analysis_results['top_serious_events'] = serious_events['adverse_event_term'].value_counts().head(10)
+        serious_counts = serious_events['adverse_event_term'].value_counts()
+        analysis_results['top_serious_events'] = serious_counts[serious_counts > 0].head(10)
         
         # 5. Toxicity by organ system
         organ_systems = self.categorize_by_organ_system(self.toxicity_data['adverse_event_term'])
@@ -129,12 +162,15 @@ class SampleAntibodyAnalyzer:
         
         # 7. Severity analysis
         severity_analysis = self.toxicity_data['severity'].value_counts()
+        severity_analysis = severity_analysis[severity_analysis > 0]
         analysis_results['severity_analysis'] = severity_analysis
         
         # 8. Outcome analysis
         outcome_analysis = self.toxicity_data['outcome'].value_counts()
+        outcome_analysis = outcome_analysis[outcome_analysis > 0]
         analysis_results['outcome_analysis'] = outcome_analysis
         
+        self.analysis_results = analysis_results
         return analysis_results
     
     def categorize_by_organ_system(self, adverse_events):
@@ -152,10 +188,14 @@ class SampleAntibodyAnalyzer:
             'Infectious': ['sepsis']
         }
         
+        # Match keywords once per distinct term, weighted by its count
+        term_counts = adverse_events.value_counts()
+        terms = term_counts.index
+        
         categorized = {}
         for category, keywords in organ_categories.items():
             pattern = '|'.join(keywords)
-            count = adverse_events.str.contains(pattern, case=False, na=False).sum()
+            count = term_counts[terms.str.contains(pattern, case=False)].sum()
             if count > 0:
                 categorized[category] = count
         
@@ -164,21 +204,23 @@ class SampleAntibodyAnalyzer:
     def analyze_study_completion(self):
         """Analyze study completion rates"""
         completion_stats = self.antibody_trials['overall_status'].value_counts()
+        completion_stats = completion_stats[completion_stats > 0]
         
         # Calculate completion rate
         total_trials = len(self.antibody_trials)
         completed_trials = completion_stats.get('Completed', 0)
         completion_rate = (completed_trials / total_trials) * 100
         
-        # Safety-related terminations
-        safety_terminations = self.antibody_trials[
-            self.antibody_trials['overall_status'].str.contains('Terminated|Suspended', case=False, na=False)
-        ]
+        # Safety-related terminations, counted from the distinct statuses
+        statuses = completion_stats.index
+        safety_terminations = completion_stats[
+            statuses.str.contains('Terminated|Suspended', case=False)
+        ].sum()
         
         return {
             'completion_stats': completion_stats,
             'completion_rate': completion_rate,
-            'safety_terminations': len(safety_terminations)
+            'safety_terminations': safety_terminations
         }
     
     def generate_summary_report(self):
@@ -284,6 +326,11 @@ Toxicity distribution across organ systems shows:
         """Create comprehensive visualizations"""
         print("Creating visualizations...")
         
+        # Plotting libraries are imported here so report-only runs do not
+        # pay their start-up cost
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         analysis = self.analyze_toxicity_profiles()
         
         # Set up the plotting style
@@ -346,6 +393,7 @@ Toxicity distribution across organ systems shows:
     
     def create_detailed_plots(self, analysis):
         """Create additional detailed visualizations"""
+        import matplotlib.pyplot as plt
         
         # Create a separate figure for serious adverse events
         plt.figure(figsize=(12, 8))
@@ -365,6 +413,11 @@ Toxicity distribution across organ systems shows:
 
 def main():
     """Main function to run the analysis"""
+    parser = argparse.ArgumentParser(description="Antibody therapeutics toxicity analysis")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="skip the visualizations and only write the summary report")
+    args = parser.parse_args()
+    
     print("Starting Antibody Therapeutics Toxicity Analysis...")
     
     # Initialize analyzer
@@ -380,12 +433,14 @@ def main():
     
     # Generate report and visualizations
     report = analyzer.generate_summary_report()
-    analyzer.create_visualizations()
+    if not args.no_plots:
+        analyzer.create_visualizations()
     
     print("\nAnalysis complete! Check the generated files:")
     print("- antibody_toxicity_summary.md (detailed report)")
-    print("- antibody_toxicity_analysis.png (main visualizations)")
-    print("- serious_adverse_events.png (serious events analysis)")
+    if not args.no_plots:
+        print("- antibody_toxicity_analysis.png (main visualizations)")
+        print("- serious_adverse_events.png (serious events analysis)")
     
     # Print key findings
     print(f"\nKey Findings:")